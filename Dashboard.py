@@ -8,20 +8,27 @@ Studio Birthday - Lightroom Macro Panel (Hybrid Portable Edition)
 """
 
 import os
+import re
 import sys
 import json
 import time
 import ctypes
 import threading
+import queue
 import subprocess
 import glob
 import shutil
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
 import webview
-import psutil
+
+from d200_common import (DaemonWorkers, find_first_window, find_procs_exact, find_sound_files,
+                         get_keyboard, invalidate_proc_cache, loads_json, proc_key, running_names,
+                         send_hotkey)
 
 # 실행 경로 설정 (EXE 실행 시와 스크립트 실행 시 대응)
 if getattr(sys, 'frozen', False):
@@ -36,11 +43,20 @@ try:
     import win32gui
     import win32con
     import win32api
-    import keyboard
     WINDOWS_AVAILABLE = True
 except ImportError:
     WINDOWS_AVAILABLE = False
 
+# 무거운 모듈은 처음 쓰는 시점에 로드 (창이 뜨기까지의 시작 시간 단축)
+# PyInstaller가 찾을 수 있도록 import 문을 그대로 둠
+_pygame = None
+
+def _get_pygame():
+    global _pygame
+    if _pygame is None:
+        import pygame as _pygame
+    return _pygame
+
 # =============================================================================
 # 설정
 # =============================================================================
@@ -61,6 +77,28 @@ DEFAULT_CONFIG = {
     }
 }
 
+# Windows 프로세스 생성 플래그 (subprocess 상수는 Windows 파이썬에만 있음)
+DETACHED_PROCESS = 0x00000008
+CREATE_NEW_CONSOLE = 0x00000010
+CREATE_NEW_PROCESS_GROUP = 0x00000200
+CREATE_NO_WINDOW = 0x08000000
+
+# 이미 압축된 사진 포맷 (ZIP 압축 시 DEFLATE 생략)
+PHOTO_EXTENSIONS = {'.jpg', '.jpeg', '.cr2', '.nef', '.arw', '.raf', '.dng', '.png'}
+
+
+@lru_cache(maxsize=16)
+def _parse_version(text: str) -> tuple:
+    """'4.10.0 (Portable)' -> (4, 10) - 문자열 비교 시 '4.10' < '4.2' 되는 문제 방지
+
+    끝의 0은 떼어 내서 '4.10'과 '4.10.0'을 같은 버전으로 취급 (튜플 길이 차이로 매번 새 버전 판정 방지)
+    """
+    m = re.match(r'\s*v?(\d+(?:\.\d+)*)', text)
+    if not m: return ()
+    parts = [int(n) for n in m.group(1).split('.')]
+    while parts and parts[-1] == 0: parts.pop()
+    return tuple(parts)
+
 
 # =============================================================================
 # Sound Player (pygame)
@@ -77,37 +115,53 @@ class SoundPlayer:
     }
     
     _initialized = False
+    _sounds = {}  # sound_type -> pygame.mixer.Sound (디코딩 결과 재사용)
     
     @classmethod
     def get_sounds_dir(cls):
         return BASE_DIR / "Sounds"
     
     @classmethod
-    def play(cls, sound_type: str):
-        """사운드 재생 (비동기)"""
-        sound_file = cls.SOUND_FILES.get(sound_type)
-        if not sound_file:
-            return
-        
-        sound_path = cls.get_sounds_dir() / sound_file
-        
-        if not sound_path.exists():
-            print(f"Sound file not found: {sound_path}")
+    def _get_sound(cls, sound_type: str):
+        """디코딩된 Sound 반환 (최초 1회만 파일에서 읽음)"""
+        snd = cls._sounds.get(sound_type)
+        if snd is not None:
+            return snd
+        sound_path = _SOUND_PATHS.get(sound_type)
+        if not sound_path:
+            return None
+        return cls._sounds.setdefault(sound_type, _get_pygame().mixer.Sound(sound_path))
+    
+    @classmethod
+    def init(cls):
+        """믹서를 미리 열고 모든 사운드를 디코딩해 둠 (앱 시작 시 1회)"""
+        # 첫 사운드 재생 지연을 없애기 위해 믹서를 미리 열어 둠 (작은 버퍼 = 낮은 지연)
+        try:
+            pygame = _get_pygame()
+            pygame.mixer.pre_init(44100, -16, 2, 512)
+            pygame.mixer.init()
+        except Exception as e:
+            print(f"Sound init error: {e}")
             return
-        
-        def _play_thread():
+        for sound_type in cls.SOUND_FILES:
             try:
-                import pygame
-                if not pygame.mixer.get_init():
-                    pygame.mixer.init()
-                pygame.mixer.music.load(str(sound_path))
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
+                cls._get_sound(sound_type)
             except Exception as e:
-                print(f"Sound playback error: {e}")
-        
-        threading.Thread(target=_play_thread, daemon=True).start()
+                print(f"Sound load error: {e}")
+    
+    @classmethod
+    def play(cls, sound_type: str):
+        """사운드 재생 (비동기 - 믹서 스레드에서 재생되므로 바로 반환)"""
+        try:
+            snd = cls._get_sound(sound_type)
+            if snd: snd.play()
+        except Exception as e:
+            print(f"Sound playback error: {e}")
+
+
+# 재생할 때마다 Path 생성/stat 하지 않도록 경로를 미리 확인해 둠
+_SOUND_PATHS = find_sound_files(SoundPlayer.get_sounds_dir(), SoundPlayer.SOUND_FILES,
+                               lambda path: print(f"Sound file not found: {path}"))
 
 
 # =============================================================================
@@ -120,40 +174,72 @@ class SessionTimer:
     def __init__(self, duration_minutes: int, on_tick=None, on_remind=None, on_end=None):
         self.duration_minutes = duration_minutes
         self.total_seconds = duration_minutes * 60
-        self.remaining_seconds = self.total_seconds
         self.is_running = False
         self._thread = None
         self.on_tick = on_tick
         self.on_remind = on_remind
         self.on_end = on_end
         self.reminder_points = {15: 'end_15min', 5: 'end_5min'}
-        self.reminded = set()
+        self._t_end = None
+        self._timers = []
+        self._left = self.total_seconds  # 멈춘 뒤 보여줄 남은 시간
+        self._stop_evt = threading.Event()
+    
+    @property
+    def remaining_seconds(self) -> int:
+        """남은 시간(초) - 종료 시각 기준으로 계산하므로 누적 오차 없음"""
+        if not self.is_running: return self._left
+        return max(0, int(round(self._t_end - time.monotonic())))
     
     def start(self):
         if self.is_running: return
         self.is_running = True
-        self.reminded.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
+        self._stop_evt.clear()
+        self._t_end = time.monotonic() + self.total_seconds
+        # 알림/종료는 정해진 시각에 한 번만 실행되는 Timer로 예약 - 그 사이에는 깨어나지 않음
+        # 남은 시간이 "m분 대"에 들어서는 순간(m:59) 알림
+        self._timers = [threading.Timer(self.total_seconds - ((m + 1) * 60 - 1), self._remind, (m, sound))
+                        for m, sound in self.reminder_points.items()
+                        if m * 60 < self.total_seconds]
+        self._timers.append(threading.Timer(self.total_seconds, self._finish))
+        for t in self._timers:
+            t.daemon = True
+            t.start()
+        if self.on_tick:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
         SoundPlayer.play('start')
     
     def stop(self):
+        if self.is_running: self._left = self.remaining_seconds
         self.is_running = False
+        self._stop_evt.set()
+        for t in self._timers: t.cancel()
     
-    def _run(self):
-        while self.remaining_seconds > 0 and self.is_running:
-            time.sleep(1)
-            self.remaining_seconds -= 1
-            if self.on_tick: self.on_tick(self.remaining_seconds)
-            remaining_min = self.remaining_seconds // 60
-            if remaining_min in self.reminder_points and remaining_min not in self.reminded:
-                self.reminded.add(remaining_min)
-                SoundPlayer.play(self.reminder_points[remaining_min])
-                if self.on_remind: self.on_remind(f"{remaining_min}분 남았습니다!")
-        if self.is_running:
-            SoundPlayer.play('end')
-            if self.on_end: self.on_end()
+    def _remind(self, minutes: int, sound: str):
+        if not self.is_running: return
+        SoundPlayer.play(sound)
+        if self.on_remind: self.on_remind(f"{minutes}분 남았습니다!")
+    
+    def _finish(self):
+        if not self.is_running: return
+        self._left = 0
         self.is_running = False
+        self._stop_evt.set()
+        if self.on_tick: self.on_tick(0)
+        SoundPlayer.play('end')
+        if self.on_end: self.on_end()
+    
+    def _run(self):
+        """화면 표시용 1초 단위 갱신 (on_tick이 있을 때만 실행, 0초 표시는 _finish가 담당)"""
+        shown = self.total_seconds
+        while True:
+            if self._stop_evt.wait(max(0, self._t_end - shown + 1 - time.monotonic())): break
+            remaining = self.remaining_seconds
+            if remaining <= 0: break
+            if remaining != shown:
+                shown = remaining
+                self.on_tick(remaining)
 
 
 # =============================================================================
@@ -161,55 +247,159 @@ class SessionTimer:
 # =============================================================================
 
 class ConfigManager:
+    # 경로별 파싱 결과 캐시: {Path: (st_mtime_ns, dict)}
+    _cache = {}
+
     def __init__(self, config_path: Path = CONFIG_FILE):
         self.config_path = config_path
         self.config = self._load()
+        self._flat = self._flatten(self.config)
+    
+    @classmethod
+    def read_json(cls, path: Path) -> dict:
+        """JSON 파일 읽기 (수정 시각이 같으면 캐시된 결과 재사용)"""
+        mtime = os.stat(path).st_mtime_ns
+        cached = cls._cache.get(path)
+        if cached and cached[0] == mtime:
+            return dict(cached[1])
+        # 텍스트 디코딩 없이 bytes 그대로 파싱
+        data = loads_json(Path(path).read_bytes())
+        if not isinstance(data, dict):  # '[...]' 같은 JSON은 설정으로 쓸 수 없음
+            raise ValueError(f"{Path(path).name}: JSON 객체가 아님")
+        cls._cache[path] = (mtime, data)
+        return dict(data)
     
     def _load(self):
-        if self.config_path.exists():
-            try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except: pass
+        try:
+            return self.read_json(self.config_path)
+        except (OSError, ValueError): pass
         return DEFAULT_CONFIG.copy()
     
+    @staticmethod
+    def _flatten(data: dict, prefix: str = '') -> dict:
+        """{'delays': {'x_ms': 1}} -> {'delays': {...}, 'delays.x_ms': 1} (중간 단계 dict도 포함)"""
+        flat = {}
+        for k, v in data.items():
+            key = prefix + k
+            flat[key] = v
+            if isinstance(v, dict):
+                flat.update(ConfigManager._flatten(v, key + '.'))
+        return flat
+    
     def get(self, key, default=None):
-        keys = key.split('.')
-        val = self.config
-        try:
-            for k in keys: val = val[k]
-            return val
-        except: return default
+        """점(.)으로 구분된 키 조회 - 로드 시 평탄화해 둔 dict에서 한 번에 찾음"""
+        return self._flat.get(key, default)
 
 
 # =============================================================================
 # Windows Controller
 # =============================================================================
 
+# 창 표시/포커스 변경 WinEvent - 대기 중 이벤트가 오면 바로 다시 확인 (폴링 간격 대기 생략)
+# WINEVENT_OUTOFCONTEXT 콜백은 훅을 건 스레드가 메시지를 꺼낼 때 실행되므로 _pump_wait에서 처리
+_winevent_tls = threading.local()
+
+if WINDOWS_AVAILABLE:
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL('user32')
+
+    _EVENT_SYSTEM_FOREGROUND = 0x0003
+    _EVENT_OBJECT_SHOW = 0x8002
+    _WINEVENT_OUTOFCONTEXT = 0x0000
+    _WINEVENT_SKIPOWNPROCESS = 0x0002
+    _OBJID_WINDOW = 0
+    _QS_ALLINPUT = 0x04FF
+    _PM_REMOVE = 0x0001
+
+    _WINEVENTPROC = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                       wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+    _user32.SetWinEventHook.argtypes = [wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE,
+                                        _WINEVENTPROC, wintypes.DWORD, wintypes.DWORD, wintypes.DWORD]
+    _user32.SetWinEventHook.restype = wintypes.HANDLE
+    _user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+    _user32.MsgWaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.c_void_p, wintypes.BOOL,
+                                                  wintypes.DWORD, wintypes.DWORD]
+    _user32.PeekMessageW.argtypes = [ctypes.POINTER(wintypes.MSG), wintypes.HWND,
+                                     wintypes.UINT, wintypes.UINT, wintypes.UINT]
+    _user32.TranslateMessage.argtypes = [ctypes.POINTER(wintypes.MSG)]
+    _user32.DispatchMessageW.argtypes = [ctypes.POINTER(wintypes.MSG)]
+
+    def _winevent_cb(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        if id_object == _OBJID_WINDOW:
+            _winevent_tls.fired = True
+
+    _winevent_proc = _WINEVENTPROC(_winevent_cb)
+
+def _hook_window_events() -> list:
+    """현재 스레드에 창 표시/포그라운드 변경 훅 설치 (해제는 _unhook_window_events)"""
+    if not WINDOWS_AVAILABLE: return []
+    hooks = []
+    for event in (_EVENT_SYSTEM_FOREGROUND, _EVENT_OBJECT_SHOW):
+        hook = _user32.SetWinEventHook(event, event, None, _winevent_proc, 0, 0,
+                                       _WINEVENT_OUTOFCONTEXT | _WINEVENT_SKIPOWNPROCESS)
+        if hook: hooks.append(hook)
+    return hooks
+
+def _unhook_window_events(hooks: list):
+    for hook in hooks:
+        _user32.UnhookWinEvent(hook)
+
+def _pump_wait(seconds: float):
+    """최대 seconds초 대기 - 그 사이 WinEvent가 들어오면 바로 반환"""
+    if not WINDOWS_AVAILABLE:
+        time.sleep(seconds)
+        return
+    _winevent_tls.fired = False
+    end = time.monotonic() + seconds
+    msg = wintypes.MSG()
+    while not _winevent_tls.fired:
+        ms = int((end - time.monotonic()) * 1000)
+        if ms <= 0: break
+        _user32.MsgWaitForMultipleObjects(0, None, False, ms, _QS_ALLINPUT)
+        while _user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, _PM_REMOVE):
+            _user32.TranslateMessage(ctypes.byref(msg))
+            _user32.DispatchMessageW(ctypes.byref(msg))
+
+def _wait_until(predicate, total_timeout: float, backoff_start: float = 0.05,
+                backoff_max: float = 0.5) -> bool:
+    """predicate()가 참이 될 때까지 대기 (total_timeout초 이내)
+    
+    창이 뜨거나 포커스가 바뀌면 즉시 다시 확인하고, 이벤트가 없으면 지수 백오프로 폴링.
+    """
+    deadline = time.monotonic() + total_timeout
+    delay = backoff_start
+    hooks = _hook_window_events()
+    try:
+        while True:
+            if predicate(): return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: return False
+            _pump_wait(min(delay, remaining))
+            delay = min(delay * 2, backoff_max)
+    finally:
+        _unhook_window_events(hooks)
+
+
 class WindowsController:
     def __init__(self, config: ConfigManager):
         self.config = config
+        self._lr_hwnd = None
+        self._lr_seen = None  # (hwnd, title, 처음 본 시각) - 로딩 완료 판단용
     
     def is_process_running(self, process_name: str) -> bool:
         if not WINDOWS_AVAILABLE: return False
-        for proc in psutil.process_iter(['name']):
-            try:
-                if proc.info['name'] and process_name.lower() in proc.info['name'].lower():
-                    return True
-            except: pass
-        return False
+        return proc_key(process_name) in running_names()
 
     def find_window_by_title(self, title_contains: str):
         if not WINDOWS_AVAILABLE: return None
-        result = []
-        def enum_callback(hwnd, _):
-            if win32gui.IsWindowVisible(hwnd):
-                title = win32gui.GetWindowText(hwnd)
-                if title_contains.lower() in title.lower():
-                    result.append(hwnd)
-            return True
-        win32gui.EnumWindows(enum_callback, None)
-        return result[0] if result else None
+        # 이전에 찾은 창이 아직 유효하면 전체 창 목록을 다시 훑지 않음
+        hwnd = self._lr_hwnd
+        if hwnd and win32gui.IsWindow(hwnd) and win32gui.IsWindowVisible(hwnd) \
+                and title_contains.lower() in win32gui.GetWindowText(hwnd).lower():
+            return hwnd
+        self._lr_hwnd = find_first_window(title_contains)
+        return self._lr_hwnd
 
     def activate_window(self, hwnd: int) -> bool:
         if not WINDOWS_AVAILABLE or not hwnd: return False
@@ -227,29 +417,41 @@ class WindowsController:
         lr_path = self.config.get('lightroom_path')
         if not lr_path or not os.path.exists(lr_path): return False
         try:
-            subprocess.Popen([lr_path])
+            # 콘솔/핸들을 물려주지 않고 완전히 분리해서 실행
+            subprocess.Popen([lr_path], creationflags=DETACHED_PROCESS | CREATE_NO_WINDOW,
+                             close_fds=True, stdin=subprocess.DEVNULL,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            invalidate_proc_cache()
             title_contains = self.config.get('lightroom_window_title_contains', 'Lightroom')
-            for _ in range(20):
-                time.sleep(1.5)
-                if self.find_window_by_title(title_contains):
-                    time.sleep(5)
-                    return True
+            self._lr_seen = None
+            return _wait_until(lambda: self._is_window_ready(title_contains), 30)
+        except: return False
+
+    def _is_window_ready(self, title_contains: str, settle: float = 1.0) -> bool:
+        """창 제목이 settle초 동안 그대로이고 메시지에 응답하면 로딩 완료로 판단"""
+        hwnd = self.find_window_by_title(title_contains)
+        if not hwnd: return False
+        key = (hwnd, win32gui.GetWindowText(hwnd))
+        now = time.monotonic()
+        if not self._lr_seen or self._lr_seen[:2] != key:
+            self._lr_seen = key + (now,)
+            return False
+        if now - self._lr_seen[2] < settle: return False
+        try:
+            win32gui.SendMessageTimeout(hwnd, win32con.WM_NULL, 0, 0, win32con.SMTO_ABORTIFHUNG, 200)
+            return True
         except: return False
-        return False
 
-    def wait_for_lightroom_focus(self, max_retries: int = 10) -> bool:
+    def wait_for_lightroom_focus(self, timeout: float = 15) -> bool:
         if not WINDOWS_AVAILABLE: return True
         title_contains = self.config.get('lightroom_window_title_contains', 'Lightroom')
-        for _ in range(max_retries):
+        def focused():
             hwnd = self.find_window_by_title(title_contains)
-            if not hwnd:
-                time.sleep(1.5)
-                continue
+            if not hwnd: return False
             if win32gui.GetForegroundWindow() == hwnd: return True
             self.activate_window(hwnd)
-            time.sleep(0.8)
-            if win32gui.GetForegroundWindow() == hwnd: return True
-        return False
+            return win32gui.GetForegroundWindow() == hwnd
+        return _wait_until(focused, timeout, 0.05, 0.3)
 
 
 # =============================================================================
@@ -260,33 +462,38 @@ class MacroActions:
     def __init__(self, config: ConfigManager):
         self.config = config
         self.win = WindowsController(config)
+        # 바탕화면 내 '내보내기' 폴더 고정 - 매 호출마다 Path.home()을 다시 풀지 않음
+        self.desktop = Path.home() / "Desktop"
+        self.export_dir = self.desktop / "내보내기"
     
     def start_tether(self):
         if not self.win.ensure_lightroom_running(): return "라이트룸 실행 실패"
         if not self.win.wait_for_lightroom_focus(): return "라이트룸 포커스 실패"
+        keyboard = get_keyboard()
         time.sleep(1.5)
-        keyboard.send('alt+f')
+        send_hotkey('alt+f')
         time.sleep(0.5)
+        # 연속 키 입력은 입력 큐에 순서대로 쌓이므로 키마다 쉬지 않고 끝에서 한 번만 대기
         for _ in range(8):
-            keyboard.send('down')
-            time.sleep(0.1)
-        keyboard.send('right')
+            send_hotkey('down')
+        time.sleep(0.2)
+        send_hotkey('right')
         time.sleep(0.3)
-        keyboard.send('enter')
+        send_hotkey('enter')
         time.sleep(0.8)
         session_name = datetime.now().strftime("%Y-%m-%d_%H-%M")
         keyboard.write(session_name)
+        time.sleep(0.2)
         for _ in range(4):
-            time.sleep(0.2)
-            keyboard.send('tab')
+            send_hotkey('tab')
         time.sleep(0.2)
         keyboard.write('1')
         time.sleep(0.3)
-        keyboard.send('enter')
+        send_hotkey('enter')
         time.sleep(2.5)
-        keyboard.send('ctrl+alt+1')
+        send_hotkey('ctrl+alt+1')
         time.sleep(0.8)
-        keyboard.send('e')
+        send_hotkey('e')
         return f"테더링 시작: {session_name}"
     
     def export_all(self):
@@ -300,12 +507,12 @@ class MacroActions:
         # 2. 라이트룸 UI가 준비될 때까지 대기 (촬영 시작과 동일)
         time.sleep(1.5)
         
-        # 3. 전체 선택 (Ctrl+A) - keyboard.send 사용
-        keyboard.send('ctrl+a')
+        # 3. 전체 선택 (Ctrl+A)
+        send_hotkey('ctrl+a')
         time.sleep(0.5)
         
-        # 4. 내보내기 단축키 (Ctrl+Alt+Shift+E) - keyboard.send 사용
-        keyboard.send('ctrl+alt+shift+e')
+        # 4. 내보내기 단축키 (Ctrl+Alt+Shift+E)
+        send_hotkey('ctrl+alt+shift+e')
         time.sleep(0.3)
         
         return "라이트룸에 내보내기 명령을 전달했습니다."
@@ -314,17 +521,18 @@ class MacroActions:
     def compress_folder(self):
         """내보내기 폴더를 ZIP으로 압축"""
         # 1. 경로 설정 (바탕화면 내 '내보내기' 폴더 고정)
-        desktop_path = Path.home() / "Desktop"
-        source_path = desktop_path / "내보내기"
+        desktop_path = self.desktop
+        source_path = self.export_dir
         
         # 2. 폴더가 없으면 생성 (에러 방지)
         if not source_path.exists():
             source_path.mkdir(parents=True, exist_ok=True)
             return None, "바탕화면에 '내보내기' 폴더가 생성되었습니다. 사진을 넣어주세요."
             
-        # 3. 파일 존재 확인
-        files = [f for f in source_path.iterdir() if f.is_file()]
-        if not files:
+        # 3. 파일 존재 확인 (scandir은 디렉터리 정보로 판별해 항목별 stat 없음)
+        with os.scandir(source_path) as it:
+            has_files = any(e.is_file(follow_symlinks=False) for e in it)
+        if not has_files:
             return None, "폴더에 사진이 없습니다. 내보내기를 먼저 해주세요."
         
         # 4. 압축 진행
@@ -332,38 +540,52 @@ class MacroActions:
         zip_filename = f"사진_{timestamp}.zip"
         zip_path = desktop_path / zip_filename
         
+        all_files = [os.path.join(root, name)
+                     for root, _, names in os.walk(source_path) for name in names]
+        # JPEG/RAW는 이미 압축된 데이터라 DEFLATE는 CPU만 쓰고 크기는 거의 그대로
+        if all(os.path.splitext(f)[1].lower() in PHOTO_EXTENSIONS for f in all_files):
+            compression, level = zipfile.ZIP_STORED, None
+        else:
+            compression, level = zipfile.ZIP_DEFLATED, 1
+        
         try:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                for file in source_path.rglob("*"):
-                    if file.is_file():
-                        zf.write(file, file.relative_to(source_path))
+            with zipfile.ZipFile(zip_path, 'w', compression, compresslevel=level) as zf:
+                for file in all_files:
+                    zf.write(file, os.path.relpath(file, source_path))
             return str(zip_path), f"압축 완료: {zip_filename}"
         except Exception as e:
             return None, f"압축 오류: {str(e)}"
     
     def end_session(self):
         """촬영 종료 - 폴더 비우기 + 라이트룸 종료"""
-        desktop_path = Path.home() / "Desktop"
-        source_path = desktop_path / "내보내기"
+        desktop_path = self.desktop
+        source_path = self.export_dir
         
+        targets = []
         if source_path.exists():
-            for item in source_path.iterdir():
-                try:
-                    if item.is_file(): item.unlink()
-                    elif item.is_dir(): shutil.rmtree(item)
-                except: pass
+            with os.scandir(source_path) as it:
+                targets = list(it)
+        targets += desktop_path.glob("사진_*.zip")
         
-        for zip_file in desktop_path.glob("사진_*.zip"):
-            try: zip_file.unlink()
-            except: pass
+        # 파일 삭제는 I/O 대기라 여러 개를 동시에 진행, 그동안 라이트룸 종료
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            ex.map(self._remove, targets)
             
-        process_name = self.config.get('lightroom_process_name', 'Lightroom.exe')
-        for proc in psutil.process_iter(['name']):
-            try:
-                if proc.info['name'] and process_name.lower() in proc.info['name'].lower():
-                    proc.terminate()
-            except: pass
+            process_name = proc_key(self.config.get('lightroom_process_name', 'Lightroom.exe'))
+            if process_name in running_names():
+                for proc in find_procs_exact(process_name):
+                    try: proc.terminate()
+                    except: pass
+                invalidate_proc_cache()
         return "세션 종료 완료"
+    
+    @staticmethod
+    def _remove(item):
+        """파일/폴더 삭제 (Path 또는 os.DirEntry)"""
+        try:
+            if item.is_file(): os.unlink(item)
+            elif item.is_dir(): shutil.rmtree(item)
+        except: pass
 
 
 # =============================================================================
@@ -371,6 +593,9 @@ class MacroActions:
 # =============================================================================
 
 class Api:
+    UPDATE_PROBE_TIMEOUT = 0.5  # 드라이브 확인 제한 시간 (초)
+    UPDATE_CHECK_TTL = 30       # 확인 결과 재사용 시간 (초)
+
     def __init__(self, actions: MacroActions, config: ConfigManager):
         self.actions = actions
         self.config = config
@@ -378,39 +603,88 @@ class Api:
         self.timer = None
         self.local_version = "4.1.0"
         self._load_local_version()
+        self._update_sources = tuple(
+            Path(drive) / "내 드라이브/01.Studio-Improvement/lightroom_macro_panel-v3_portable/version.json"
+            for drive in ("H:/", "G:/"))
+        self._update_checked = None  # (확인 시각, 결과)
+        # 버튼 클릭마다 스레드를 새로 만들지 않고 작업자 스레드 재사용
+        # 데몬 스레드라서 창을 닫으면 진행 중인 매크로를 기다리지 않고 바로 종료
+        self._pool = DaemonWorkers(2, 'macro')
+        # 타이머/알림 UI 호출은 전담 스레드 하나가 모아서 전달
+        # updateTimer는 최신 값 하나만 _ui_latest에 두고 큐에는 깨우기(None)만 넣음
+        self._ui_latest = {}
+        self._ui_queue = queue.Queue()
+        threading.Thread(target=self._ui_loop, daemon=True).start()
+
+    def _ui_call(self, fn_name: str, arg: str):
+        """JS 함수 호출 예약 - 타이머는 밀린 틱을 새 값으로 덮어씀 (마지막 00:00도 그대로 전달)"""
+        if fn_name == 'updateTimer':
+            self._ui_latest['updateTimer'] = arg
+            self._ui_queue.put(None)
+        else:
+            self._ui_queue.put((fn_name, arg))
+
+    def _ui_loop(self):
+        """쌓인 호출을 한 번의 evaluate_js로 묶어 전송 (updateTimer는 최신 값만)"""
+        while True:
+            batch = [self._ui_queue.get()]
+            while True:
+                try: batch.append(self._ui_queue.get_nowait())
+                except queue.Empty: break
+            calls = [call for call in batch if call is not None]
+            # dict.pop은 원자적 - 그 사이 들어온 새 값은 다음 깨우기에서 전달됨
+            timer = self._ui_latest.pop('updateTimer', None)
+            if timer is not None: calls.insert(0, ('updateTimer', timer))
+            if not calls: continue
+            script = '; '.join(f'{fn}({json.dumps(arg)})' for fn, arg in calls)
+            if self.window:
+                try: self.window.evaluate_js(script)
+                except Exception as e: print(f"UI update error: {e}")
 
     def _load_local_version(self):
-        v_path = BASE_DIR / "version.json"
-        if v_path.exists():
-            try:
-                with open(v_path, "r", encoding="utf-8") as f:
-                    self.local_version = json.load(f).get("version", self.local_version)
-            except: pass
+        try:
+            data = ConfigManager.read_json(BASE_DIR / "version.json")
+            self.local_version = data.get("version", self.local_version)
+        except: pass
+
+    def _probe_update(self, v_path: Path):
+        """드라이브 하나의 version.json 확인 - 새 버전이면 결과 dict, 아니면 None"""
+        try:
+            if v_path.is_file():
+                data = ConfigManager.read_json(v_path)
+                remote_version = data.get("version", "")
+                if remote_version and _parse_version(remote_version) > _parse_version(self.local_version):
+                    return {
+                        "available": True,
+                        "version": remote_version,
+                        "message": data.get("message", "새로운 버전이 준비되었습니다.")
+                    }
+        except: pass # 드라이브가 없거나 권한 에러
+        return None
 
     def check_update(self):
-        """본부(구글 드라이브)의 버전과 비교 (지연 방지를 위해 별도 스레드 권장)"""
-        # 드라이브 체크를 매우 가볍게 시도
-        sources = [
-            Path("H:/내 드라이브/01.Studio-Improvement/lightroom_macro_panel-v3_portable/version.json"),
-            Path("G:/내 드라이브/01.Studio-Improvement/lightroom_macro_panel-v3_portable/version.json")
-        ]
+        """본부(구글 드라이브)의 버전과 비교 (끊긴 드라이브 때문에 UI가 멈추지 않도록 제한 시간 내 응답)"""
+        now = time.monotonic()
+        if self._update_checked and now - self._update_checked[0] < self.UPDATE_CHECK_TTL:
+            return self._update_checked[1]
         
-        for v_path in sources:
+        # 드라이브별로 동시에 확인 - 응답 없는 드라이브는 daemon 스레드에 남겨두고 포기
+        results = queue.Queue()
+        for v_path in self._update_sources:
+            threading.Thread(target=lambda p=v_path: results.put(self._probe_update(p)),
+                             daemon=True).start()
+        deadline = now + self.UPDATE_PROBE_TIMEOUT
+        result = {"available": False}
+        for _ in self._update_sources:
             try:
-                # 존재 여부 확인 시 타임아웃을 유발할 수 있는 OS 호출 최소화
-                if v_path.is_file(): 
-                    with open(v_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        remote_version = data.get("version", "")
-                        if remote_version and remote_version > self.local_version:
-                            return {
-                                "available": True,
-                                "version": remote_version,
-                                "message": data.get("message", "새로운 버전이 준비되었습니다.")
-                            }
-            except: 
-                continue # 드라이브가 없거나 권한 에러 시 즉시 다음으로
-        return {"available": False}
+                found = results.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if found:
+                result = found
+                break
+        self._update_checked = (now, result)
+        return result
 
     def apply_update(self):
         """업데이트 스크립트 실행 후 프로그램 종료"""
@@ -420,7 +694,9 @@ class Api:
                 sync_script = Path("G:/내 드라이브/01.Studio-Improvement/SYNC.bat")
 
             if sync_script.exists():
-                subprocess.Popen(['cmd', '/c', 'start', '', str(sync_script)], shell=True)
+                # cmd /c start 를 거치지 않고 새 콘솔 창에서 바로 실행
+                subprocess.Popen([str(sync_script)], close_fds=True,
+                                 creationflags=CREATE_NEW_CONSOLE | CREATE_NEW_PROCESS_GROUP)
                 time.sleep(0.5)
                 os._exit(0)
         
@@ -446,14 +722,11 @@ class Api:
             except Exception as e:
                 result = f"오류: {str(e)}"
             
-            # 메인 UI가 응답할 수 있도록 결과 전달 시점을 약간 조절
+            # evaluate_js는 내부에서 UI 스레드로 넘겨주므로 바로 호출해도 안전
             if self.window:
-                # 안전한 호출을 위해 evaluate_js 전송 전 짧은 휴식
-                time.sleep(0.2)
-                self.window.evaluate_js(f'hideLoading(); updateStatus("{result}")')
+                self.window.evaluate_js(f'hideLoading(); updateStatus({json.dumps(result)})')
         
-        thread = threading.Thread(target=run_in_bg, daemon=True)
-        thread.start()
+        self._pool.submit(run_in_bg)
         return "명령 전달됨"
     
     def start_session(self, minutes: int) -> str:
@@ -468,10 +741,9 @@ class Api:
                 result = f"오류: {str(e)}"
             
             if self.window:
-                time.sleep(0.2)
-                self.window.evaluate_js(f'hideLoading(); updateStatus("{result}")')
+                self.window.evaluate_js(f'hideLoading(); updateStatus({json.dumps(result)})')
         
-        threading.Thread(target=run_in_bg, daemon=True).start()
+        self._pool.submit(run_in_bg)
         return "준비 중..."
 
 
@@ -479,13 +751,12 @@ class Api:
     def _start_timer(self, minutes: int):
         if self.timer and self.timer.is_running: self.timer.stop()
         def on_tick(remaining):
-            if self.window:
-                m, s = divmod(remaining, 60)
-                self.window.evaluate_js(f'updateTimer("{m:02d}:{s:02d}")')
+            m, s = divmod(remaining, 60)
+            self._ui_call('updateTimer', f"{m:02d}:{s:02d}")
         def on_remind(msg):
-            if self.window: self.window.evaluate_js(f'showReminder("{msg}")')
+            self._ui_call('showReminder', msg)
         def on_end():
-            if self.window: self.window.evaluate_js('showReminder("재촬영 시간이 종료되었습니다.")')
+            self._ui_call('showReminder', "재촬영 시간이 종료되었습니다.")
         self.timer = SessionTimer(minutes, on_tick, on_remind, on_end)
         self.timer.start()
 
@@ -498,6 +769,9 @@ class Api:
 # =============================================================================
 
 def main():
+    # pygame 로드/믹서 초기화는 창 생성과 병행
+    threading.Thread(target=SoundPlayer.init, daemon=True).start()
+    
     config = ConfigManager()
     actions = MacroActions(config)
     api = Api(actions, config)
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Studio Birthday - Dashboard.py / main.py 공용 헬퍼
+두 실행 파일이 똑같이 쓰는 프로세스/창 조회, 작업자 스레드, 설정 JSON 파싱, 핫키 전송, 사운드 파일 확인 코드
+(각 스크립트가 import하므로 PyInstaller가 실행 파일마다 함께 묶어 줌)
+"""
+
+import os
+import json
+import time
+import ctypes
+import queue
+import threading
+import traceback
+from functools import lru_cache
+
+# JSON 파싱 가속 (선택) - 없으면 표준 json 사용
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Windows 전용 모듈
+try:
+    import win32gui
+    WINDOWS_AVAILABLE = True
+except ImportError:
+    WINDOWS_AVAILABLE = False
+
+# 무거운 모듈은 처음 쓰는 시점에 로드 (Dashboard 창이 뜨기까지의 시작 시간 단축)
+# PyInstaller가 찾을 수 있도록 import 문을 그대로 둠
+_psutil = None
+_keyboard = None
+
+def get_psutil():
+    global _psutil
+    if _psutil is None:
+        import psutil as _psutil
+    return _psutil
+
+def get_keyboard():
+    global _keyboard
+    if _keyboard is None:
+        import keyboard as _keyboard
+    return _keyboard
+
+
+# =============================================================================
+# 작업자 스레드
+# =============================================================================
+
+class DaemonWorkers:
+    """작업자 스레드 count개를 재사용하는 작업 큐 (submit은 바로 반환)
+
+    ThreadPoolExecutor의 작업자는 데몬이 아니라서 인터프리터 종료 시 실행 중인 매크로가
+    끝날 때까지 기다림 (atexit보다 먼저 join). 창을 닫거나 Ctrl+C를 누르면 키 입력을
+    멈추고 바로 종료되도록 데몬 스레드를 씀.
+    """
+
+    def __init__(self, count: int, name: str):
+        self._tasks = queue.SimpleQueue()
+        for i in range(count):
+            threading.Thread(target=self._run, name=f'{name}_{i}', daemon=True).start()
+
+    def submit(self, fn, *args):
+        self._tasks.put((fn, args))
+
+    def _run(self):
+        while True:
+            fn, args = self._tasks.get()
+            try:
+                fn(*args)
+            except Exception:
+                # 작업 하나가 실패해도 작업자는 계속 동작 (스레드별 실행 때처럼 traceback 출력)
+                traceback.print_exc()
+
+
+# =============================================================================
+# JSON
+# =============================================================================
+
+def loads_json(raw: bytes):
+    """파일에서 읽은 bytes -> 객체 (orjson은 BOM을 받지 않으므로 미리 제거)"""
+    if raw.startswith(b'\xef\xbb\xbf'): raw = raw[3:]
+    if orjson is not None: return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# =============================================================================
+# 키보드
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def parse_hotkey(hotkey: str) -> tuple:
+    """'alt+f' -> 스캔코드 튜플 (매크로마다 같은 문자열을 다시 파싱하지 않음)"""
+    return get_keyboard().parse_hotkey(hotkey)
+
+def send_hotkey(hotkey: str):
+    """캐시된 스캔코드로 조합키 전송 - 단계마다 모두 누른 뒤 역순으로 뗌 (keyboard.send와 동일)
+
+    파싱된 튜플을 keyboard.send에 다시 넘기면 한 단계짜리 조합키가 키 하나로 합쳐져
+    첫 번째 키만 눌리므로 press/release를 직접 호출함.
+    """
+    keyboard = get_keyboard()
+    for step in parse_hotkey(hotkey):
+        for scan_codes in step:
+            keyboard.press(scan_codes[0])
+        for scan_codes in reversed(step):
+            keyboard.release(scan_codes[0])
+
+
+# =============================================================================
+# 사운드 파일
+# =============================================================================
+
+def find_sound_files(sounds_dir, sound_files: dict, on_missing=None) -> dict:
+    """sound_type -> 실제 존재하는 파일 경로(str) (import 시 한 번만 확인)
+
+    없는 파일은 on_missing(경로)로 알림.
+    """
+    paths = {}
+    for sound_type, filename in sound_files.items():
+        path = os.path.join(sounds_dir, filename)
+        if os.path.isfile(path):
+            paths[sound_type] = path
+        elif on_missing:
+            on_missing(path)
+    return paths
+
+
+# =============================================================================
+# 프로세스
+# =============================================================================
+
+# Toolhelp32 스냅샷으로 프로세스 이름만 바로 읽음 (psutil의 프로세스별 조회 생략)
+if WINDOWS_AVAILABLE:
+    from ctypes import wintypes
+
+    class _PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ('dwSize', wintypes.DWORD),
+            ('cntUsage', wintypes.DWORD),
+            ('th32ProcessID', wintypes.DWORD),
+            ('th32DefaultHeapID', ctypes.c_size_t),
+            ('th32ModuleID', wintypes.DWORD),
+            ('cntThreads', wintypes.DWORD),
+            ('th32ParentProcessID', wintypes.DWORD),
+            ('pcPriClassBase', wintypes.LONG),
+            ('dwFlags', wintypes.DWORD),
+            ('szExeFile', wintypes.WCHAR * 260),
+        ]
+
+    _TH32CS_SNAPPROCESS = 0x00000002
+    _INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+    _kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+def _toolhelp_names() -> set:
+    """CreateToolhelp32Snapshot으로 실행 중인 exe 이름(casefold) 수집"""
+    snap = _kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+    if snap == _INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        entry = _PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(entry)
+        names = set()
+        ok = _kernel32.Process32FirstW(snap, ctypes.byref(entry))
+        while ok:
+            names.add(entry.szExeFile.casefold())
+            ok = _kernel32.Process32NextW(snap, ctypes.byref(entry))
+        return names
+    finally:
+        _kernel32.CloseHandle(snap)
+
+def proc_key(name: str) -> str:
+    """프로세스 이름 비교용 정규화 (경로 제거 + casefold): 'C:\\...\\Lightroom.exe' -> 'lightroom.exe'"""
+    return os.path.basename(name).casefold()
+
+def _iter_proc_names():
+    """(프로세스, 이름) 순회 - 그새 종료됐거나 접근 권한이 없는 프로세스는 건너뜀"""
+    psutil = get_psutil()
+    for proc in psutil.process_iter():
+        try:
+            name = proc.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        if name: yield proc, name
+
+# 프로세스 목록 스냅샷 (짧은 시간 내 반복 조회 시 재사용)
+_proc_cache = {'t': 0.0, 'names': frozenset()}
+
+def running_names(ttl: float = 0.5) -> frozenset:
+    """실행 중인 프로세스 이름(casefold) 집합 - ttl초 동안 캐시"""
+    now = time.monotonic()
+    if now - _proc_cache['t'] > ttl:
+        if WINDOWS_AVAILABLE:
+            names = _toolhelp_names()
+        else:
+            names = {name.casefold() for _, name in _iter_proc_names()}
+        _proc_cache['names'] = frozenset(names)
+        _proc_cache['t'] = now
+    return _proc_cache['names']
+
+def invalidate_proc_cache():
+    """프로세스 실행/종료 직후 스냅샷 무효화"""
+    _proc_cache['t'] = 0.0
+
+def find_procs_exact(key: str) -> list:
+    """이름이 정확히 일치하는 프로세스 목록 (key는 proc_key()로 정규화한 이름)"""
+    return [proc for proc, name in _iter_proc_names() if name.casefold() == key]
+
+
+# =============================================================================
+# 창
+# =============================================================================
+
+# EnumWindows 콜백은 한 번만 만들어 재사용 (호출마다 클로저/콜백 객체 생성 방지)
+# 검색어와 결과는 호출 스레드별로 _enum_tls에 둠 (EnumWindows는 동기 호출)
+# 첫 번째로 일치하는 창을 찾으면 False를 돌려 열거를 바로 중단
+_enum_tls = threading.local()
+
+if WINDOWS_AVAILABLE:
+    _user32 = ctypes.WinDLL('user32')
+    _WNDENUMPROC = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+    _user32.EnumWindows.argtypes = [_WNDENUMPROC, ctypes.c_void_p]
+
+    def _enum_windows_cb(hwnd, _):
+        try:
+            if win32gui.IsWindowVisible(hwnd) and _enum_tls.needle in win32gui.GetWindowText(hwnd).lower():
+                _enum_tls.hit = hwnd
+                return False
+        except: pass
+        return True
+
+    _enum_windows_proc = _WNDENUMPROC(_enum_windows_cb)
+
+def find_first_window(title_contains: str):
+    """제목에 title_contains가 포함된 첫 번째 보이는 최상위 창 (없거나 Windows가 아니면 None)"""
+    if not WINDOWS_AVAILABLE: return None
+    _enum_tls.needle = title_contains.lower()
+    _enum_tls.hit = None
+    _user32.EnumWindows(_enum_windows_proc, None)
+    return _enum_tls.hit
@@ -7,24 +7,43 @@ Platform: Windows 11
 
 import os
 import sys
-import json
+import atexit
 import time
 import subprocess
-import threading
+import queue
+import logging
+import logging.handlers
 from pathlib import Path
 from datetime import datetime
 
+# 로그는 큐에 넣기만 하고 출력은 리스너 스레드가 담당 (매크로 스레드가 stdout 쓰기에 막히지 않음)
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)  # 종료 시 큐에 남은 로그까지 출력
+logger = logging.getLogger('d200')
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
 # Library imports with error handling for non-Windows dev environment
 try:
     import keyboard
-    import psutil
-    import pygame
 except ImportError as e:
-    print(f"Error: Missing required library: {e}")
-    print("Please install requirements: pip install keyboard psutil pygame pywin32")
+    logger.error(f"Error: Missing required library: {e}")
+    logger.error("Please install requirements: pip install keyboard psutil pygame pywin32")
     # For dev purposes, we don't exit immediately to allow file creation, 
     # but runtime will fail if libs are missing.
 
+# Sound is optional: without pygame the controller still runs, just silently
+try:
+    import pygame
+    # Small buffer (512 frames) keeps reminder latency low; applied when the mixer opens
+    pygame.mixer.pre_init(44100, -16, 2, 512)
+except ImportError as e:
+    logger.warning(f"Warning: pygame not available, sounds disabled: {e}")
+    pygame = None
+
 WINDOWS_AVAILABLE = False
 try:
     import win32gui
@@ -33,6 +52,9 @@ try:
 except ImportError:
     pass
 
+from d200_common import (DaemonWorkers, find_first_window, find_procs_exact, find_sound_files,
+                         invalidate_proc_cache, loads_json, proc_key, running_names, send_hotkey)
+
 # =============================================================================
 # Configuration & Constants
 # =============================================================================
@@ -41,17 +63,41 @@ BASE_DIR = Path(__file__).parent
 CONFIG_FILE = BASE_DIR / "config.json"
 SOUNDS_DIR = BASE_DIR / "Sounds"
 
+# Windows 프로세스 생성 플래그 (subprocess 상수는 Windows 파이썬에만 있음)
+DETACHED_PROCESS = 0x00000008
+CREATE_NEW_PROCESS_GROUP = 0x00000200
+
+# 테더링 시작 매크로: (직전 단계로부터의 대기 ms, 동작, 키/문자열)
+SESSION_NAME = object()  # 실행 시점의 세션 이름으로 치환
+TETHER_SEQUENCE = (
+    [(1000, 'send', 'alt+f')]                     # a. Alt+F (Stability wait 후)
+    + [(400, 'send', 'down')]                     # b. Down x 8
+    + [(100, 'send', 'down')] * 7
+    + [(100, 'send', 'right'),                    # c. Right
+       (300, 'send', 'enter'),                    # d. Enter
+       (800, 'write', SESSION_NAME)]              # e. Session Name
+    + [(200, 'send', 'tab')] * 4                  # f. Tab x 4
+    + [(200, 'write', '1'),                       # g. Type "1"
+       (300, 'send', 'enter'),                    # h. Enter
+       (2500, 'send', 'ctrl+alt+1'),              # i. Ctrl+Alt+1 (Preset) - 테더 바 생성 대기 후
+       (800, 'send', 'e')]                        # j. E (Library View)
+)
+
 class Config:
     def __init__(self):
         self.data = self._load()
     
     def _load(self):
-        if CONFIG_FILE.exists():
-            try:
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[설정 오류] 파일을 읽을 수 없습니다: {e}")
+        try:
+            with open(CONFIG_FILE, 'rb') as f:
+                data = loads_json(f.read())
+            if not isinstance(data, dict):  # '[...]' 같은 JSON은 설정으로 쓸 수 없음
+                raise ValueError("JSON 객체가 아님")
+            return data
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"[설정 오류] 파일을 읽을 수 없습니다: {e}")
         return {}
 
     def get(self, key, default=None):
@@ -62,48 +108,79 @@ class Config:
 # =============================================================================
 
 class SoundPlayer:
-    @staticmethod
-    def play(filename):
-        path = SOUNDS_DIR / filename
-        if not path.exists():
-            print(f"[사운드 경고] 파일을 찾을 수 없음: {filename}")
+    SOUND_FILES = {
+        'start': 'Start_shoot.mp3',
+        'end_15min': 'end_15min.mp3',
+        'end_5min': 'end_5min.mp3',
+        'end': 'The_end.mp3'
+    }
+
+    _sounds = {}  # sound_type -> pygame.mixer.Sound (시작 시 한 번만 디코딩)
+
+    @classmethod
+    def init(cls):
+        """믹서를 열고 모든 사운드를 미리 디코딩 (프로그램 시작 시 1회)"""
+        if pygame is None:
             return
-
-        def _worker():
+        # 첫 사운드 재생 지연을 없애기 위해 믹서를 미리 열어 둠
+        try:
+            pygame.mixer.init()
+        except Exception as e:
+            logger.error(f"[사운드 오류] 믹서 초기화 실패: {e}")
+            return
+        for sound_type, path in _SOUND_PATHS.items():
             try:
-                if not pygame.mixer.get_init():
-                    pygame.mixer.init()
-                pygame.mixer.music.load(str(path))
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
+                cls._sounds[sound_type] = pygame.mixer.Sound(path)
             except Exception as e:
-                print(f"[사운드 오류] 재생 실패: {e}")
-        
-        threading.Thread(target=_worker, daemon=True).start()
+                logger.error(f"[사운드 오류] 불러오기 실패 ({os.path.basename(path)}): {e}")
+
+    @classmethod
+    def play(cls, sound_type):
+        """사운드 재생 - Sound.play()는 믹서 스레드에서 재생되므로 바로 반환"""
+        snd = cls._sounds.get(sound_type)
+        if snd is None:
+            return
+        try:
+            snd.play()
+        except Exception as e:
+            logger.error(f"[사운드 오류] 재생 실패: {e}")
+
+# 재생할 때마다 Path 생성/stat 하지 않도록 경로를 미리 확인해 둠
+_SOUND_PATHS = find_sound_files(
+    SOUNDS_DIR, SoundPlayer.SOUND_FILES,
+    lambda path: logger.warning(f"[사운드 경고] 파일을 찾을 수 없음: {os.path.basename(path)}"))
 
 # =============================================================================
 # Lightroom Controller
 # =============================================================================
 
 class LightroomController:
+    # 매크로 상태 - 참조 하나의 대입은 GIL 아래에서 원자적이므로 락 없이 전환
+    IDLE = 'idle'
+    RUNNING = 'running'
+
     def __init__(self, config):
         self.config = config
-        self.is_running_macro = False
-        self._lock = threading.Lock()
+        self._state = self.IDLE
+        # 시퀀스는 작업자 스레드 하나에서 차례로 실행 (핫키마다 스레드 생성 안 함)
+        # 데몬 스레드라서 Ctrl+C 시 진행 중인 시퀀스를 끝까지 기다리지 않고 바로 종료
+        self._worker = DaemonWorkers(1, 'd200-seq')
+
+    def start_session(self):
+        """테더링 시퀀스를 작업자 스레드에 넘기고 바로 반환"""
+        # 핫키 콜백은 키보드 훅 스레드 하나에서만 불리므로 확인과 전환 사이에 끼어들 쪽이 없음
+        # 넘기기 전에 RUNNING으로 바꿔서 대기 중인 시퀀스가 중복으로 쌓이지 않게 함
+        if self._state != self.IDLE:
+            logger.warning("[경고] 이미 매크로가 실행 중입니다.")
+            return
+        self._state = self.RUNNING
+        self._worker.submit(self.run_tether_sequence)
 
     def _find_window(self, title_text):
         if not WINDOWS_AVAILABLE: return None
-        result = []
-        def callback(hwnd, _):
-            if win32gui.IsWindowVisible(hwnd):
-                t = win32gui.GetWindowText(hwnd)
-                if title_text.lower() in t.lower():
-                    result.append(hwnd)
         try:
-            win32gui.EnumWindows(callback, None)
-        except: pass
-        return result[0] if result else None
+            return find_first_window(title_text)
+        except: return None
 
     def _activate_window(self, hwnd):
         if not WINDOWS_AVAILABLE: return
@@ -119,23 +196,21 @@ class LightroomController:
         lr_path = self.config.get("lightroom_path")
         process_name = self.config.get("lightroom_process_name", "Lightroom.exe")
         
-        is_running = False
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] and process_name.lower() in proc.info['name'].lower():
-                is_running = True
-                break
-        
-        if not is_running:
+        if proc_key(process_name) not in running_names():
             if not lr_path or not os.path.exists(lr_path):
-                print(f"[오류] 라이트룸 경로가 잘못되었습니다: {lr_path}")
+                logger.error(f"[오류] 라이트룸 경로가 잘못되었습니다: {lr_path}")
                 return False
-            print("[시스템] 라이트룸 실행 중...")
-            subprocess.Popen([lr_path])
+            logger.info("[시스템] 라이트룸 실행 중...")
+            # 콘솔/핸들을 물려주지 않고 완전히 분리해서 실행
+            subprocess.Popen([lr_path], creationflags=DETACHED_PROCESS | CREATE_NEW_PROCESS_GROUP,
+                             close_fds=True, stdin=subprocess.DEVNULL,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            invalidate_proc_cache()
             time.sleep(5) # Initial wait
         
         # 2. Focus
         title_keyword = self.config.get("lightroom_window_title_contains", "Lightroom")
-        print(f"[시스템] 라이트룸 창 활성화 대기 중 ({title_keyword})...")
+        logger.info(f"[시스템] 라이트룸 창 활성화 대기 중 ({title_keyword})...")
         
         for i in range(20):
             hwnd = self._find_window(title_keyword)
@@ -144,128 +219,119 @@ class LightroomController:
                 time.sleep(0.5)
                 # Double check focus
                 if WINDOWS_AVAILABLE and win32gui.GetForegroundWindow() == hwnd:
-                    print("[시스템] 라이트룸 포커스 확보 완료")
+                    logger.info("[시스템] 라이트룸 포커스 확보 완료")
                     return True
             time.sleep(1.0)
             
-        print("[오류] 라이트룸 창을 찾을 수 없거나 활성화할 수 없습니다.")
+        logger.error("[오류] 라이트룸 창을 찾을 수 없거나 활성화할 수 없습니다.")
         return False
 
     def kill_process(self):
-        process_name = self.config.get("lightroom_process_name", "Lightroom.exe")
+        process_name = proc_key(self.config.get("lightroom_process_name", "Lightroom.exe"))
         killed = False
-        for proc in psutil.process_iter(['name']):
-            try:
-                if proc.info['name'] and process_name.lower() in proc.info['name'].lower():
+        if process_name in running_names():
+            for proc in find_procs_exact(process_name):
+                try:
                     proc.terminate()
                     killed = True
-            except: pass
+                except: pass
+            invalidate_proc_cache()
         
         if killed:
-            print("[시스템] 라이트룸 프로세스가 종료되었습니다.")
+            logger.info("[시스템] 라이트룸 프로세스가 종료되었습니다.")
         else:
-            print("[시스템] 실행 중인 라이트룸 프로세스가 없습니다.")
+            logger.info("[시스템] 실행 중인 라이트룸 프로세스가 없습니다.")
 
     def run_tether_sequence(self):
-        if self.is_running_macro:
-            print("[경고] 이미 매크로가 실행 중입니다.")
-            return
-
-        with self._lock:
-            self.is_running_macro = True
-
+        """start_session이 RUNNING으로 바꾼 뒤 작업자 스레드에서 실행"""
         try:
             if not self.launch_and_focus():
                 return
 
-            print("[매크로] 테더링 시작 시퀀스 진행...")
-            time.sleep(1.0) # Stability wait
-
-            # a. Alt+F
-            keyboard.send('alt+f')
-            time.sleep(0.4)
-
-            # b. Down x 8
-            for _ in range(8):
-                keyboard.send('down')
-                time.sleep(0.1)
-            
-            # c. Right
-            keyboard.send('right')
-            time.sleep(0.3)
-
-            # d. Enter
-            keyboard.send('enter')
-            time.sleep(0.8)
-
-            # e. Session Name
+            logger.info("[매크로] 테더링 시작 시퀀스 진행...")
             session_name = datetime.now().strftime("%Y-%m-%d_%H-%M")
-            keyboard.write(session_name)
-            
-            # f. Tab x 4
-            for _ in range(4):
-                time.sleep(0.2)
-                keyboard.send('tab')
-            
-            # g. Type "1"
-            time.sleep(0.2)
-            keyboard.write('1')
-            time.sleep(0.3)
-
-            # h. Enter
-            keyboard.send('enter')
-            time.sleep(2.5) # Wait for tether bar creation
-
-            # i. Ctrl+Alt+1 (Preset)
-            keyboard.send('ctrl+alt+1')
-            time.sleep(0.8)
 
-            # j. E (Library View)
-            keyboard.send('e')
-
-            print(f"[완료] 테더링 시작됨: {session_name}")
-            SoundPlayer.play("Start_shoot.mp3")
+            # 각 단계의 시각을 시작 시점 기준으로 누적 계산 - sleep마다 생기는 지연이 쌓이지 않음
+            t = time.monotonic()
+            for delay_ms, op, arg in TETHER_SEQUENCE:
+                t += delay_ms / 1000.0
+                wait = t - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                if op == 'write':
+                    keyboard.write(session_name if arg is SESSION_NAME else arg)
+                else:
+                    send_hotkey(arg)
+
+            logger.info(f"[완료] 테더링 시작됨: {session_name}")
+            SoundPlayer.play('start')
 
         except Exception as e:
-            print(f"[오류] 매크로 실행 중 에러 발생: {e}")
+            logger.error(f"[오류] 매크로 실행 중 에러 발생: {e}")
         finally:
-            self.is_running_macro = False
+            self._state = self.IDLE
 
 # =============================================================================
 # Main
 # =============================================================================
 
 def main():
-    print("\n" + "="*50)
-    print("   D200 Studio Controller (Headless)")
-    print("   - Ctrl+Alt+Shift+F1 : 촬영 시작 (테더링)")
-    print("   - Ctrl+Alt+Shift+F3 : 세션 종료 (강제종료)")
-    print("="*50 + "\n")
+    logger.info("\n" + "="*50)
+    logger.info("   D200 Studio Controller (Headless)")
+    logger.info("   - Ctrl+Alt+Shift+F1 : 촬영 시작 (테더링)")
+    logger.info("   - Ctrl+Alt+Shift+F3 : 세션 종료 (강제종료)")
+    logger.info("="*50 + "\n")
+
+    SoundPlayer.init()
 
     config = Config()
     lr_controller = LightroomController(config)
 
     def on_start():
-        print("\n>>> [명령] 촬영 시작 요청")
-        threading.Thread(target=lr_controller.run_tether_sequence, daemon=True).start()
+        logger.info("\n>>> [명령] 촬영 시작 요청")
+        lr_controller.start_session()
 
     def on_end():
-        print("\n>>> [명령] 세션 종료 요청")
+        logger.info("\n>>> [명령] 세션 종료 요청")
         lr_controller.kill_process()
-        SoundPlayer.play("The_end.mp3")
-        print("[정보] 세션이 종료되었습니다.")
+        SoundPlayer.play('end')
+        logger.info("[정보] 세션이 종료되었습니다.")
 
     # Hotkey Registration
     try:
-        # suppress=True prevents the key from reaching the active window
-        keyboard.add_hotkey('ctrl+alt+shift+f1', on_start, suppress=True)
-        keyboard.add_hotkey('ctrl+alt+shift+f3', on_end, suppress=True)
-        print("[대기] 핫키 입력 대기 중... (종료하려면 터미널 닫기)")
+        # 스캔코드는 시작 시 한 번만 계산 (좌/우 Ctrl 등 여러 코드를 가진 키 포함)
+        modifiers = [keyboard.key_to_scan_codes(name) for name in ('ctrl', 'alt', 'shift')]
+        actions = {}
+        for name, action in (('f1', on_start), ('f3', on_end)):
+            for code in keyboard.key_to_scan_codes(name):
+                actions[code] = action
+        held = set()  # 눌린 채인 핫키 - 자동 반복 입력에 다시 실행하지 않음
+
+        def dispatch(event):
+            """단일 저수준 훅: Ctrl+Alt+Shift+F1/F3만 가로채고 나머지 키는 그대로 통과 (False = 차단)"""
+            action = actions.get(event.scan_code)
+            if action is None:
+                return True
+            if event.event_type == keyboard.KEY_UP:
+                if event.scan_code in held:
+                    held.discard(event.scan_code)
+                    return False
+                return True
+            if not all(any(keyboard.is_pressed(code) for code in codes) for codes in modifiers):
+                return True
+            if event.scan_code not in held:
+                held.add(event.scan_code)
+                action()
+            return False
+
+        # suppress=True: 훅이 False를 반환한 키는 활성 창에 전달되지 않음
+        keyboard.hook(dispatch, suppress=True)
+        logger.info("[대기] 핫키 입력 대기 중... (종료하려면 터미널 닫기)")
         keyboard.wait()
     except KeyboardInterrupt:
-        print("\n[시스템] 프로그램을 종료합니다.")
+        logger.info("\n[시스템] 프로그램을 종료합니다.")
     except Exception as e:
-        print(f"\n[치명적 오류] {e}")
+        logger.error(f"\n[치명적 오류] {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""d200_common 공용 헬퍼 테스트"""
+
+import threading
+
+import pytest
+
+import d200_common
+
+SCAN_CODES = {
+    'left alt': 56, 'left ctrl': 29, 'left shift': 42,
+    'f': 33, 'e': 18, 'a': 30, '1': 2, 'down': 80,
+}
+
+
+@pytest.fixture
+def keyboard(monkeypatch):
+    """실제 keyboard 파서를 쓰고 OS 입력 계층만 기록용으로 대체"""
+    keyboard = pytest.importorskip('keyboard')
+    events = []
+    os_keyboard = keyboard._os_keyboard
+    monkeypatch.setattr(os_keyboard, 'map_name',
+                        lambda name: iter([(SCAN_CODES[name], ())] if name in SCAN_CODES else []))
+    monkeypatch.setattr(os_keyboard, 'press', lambda code: events.append(('down', code)))
+    monkeypatch.setattr(os_keyboard, 'release', lambda code: events.append(('up', code)))
+    monkeypatch.setattr(keyboard._listener, 'start_if_necessary', lambda: None)
+    monkeypatch.setattr(keyboard, 'sent', events, raising=False)
+    d200_common.parse_hotkey.cache_clear()
+    yield keyboard
+    d200_common.parse_hotkey.cache_clear()
+
+
+def test_daemon_workers_run_tasks_on_daemon_threads():
+    done = threading.Event()
+    seen = []
+
+    def record(name):
+        seen.append((name, threading.current_thread().daemon))
+        done.set()
+
+    workers = d200_common.DaemonWorkers(1, 'test')
+    workers.submit(record, 'job')
+    assert done.wait(2)
+    assert seen == [('job', True)]
+
+
+def test_daemon_workers_report_failed_task_and_keep_running(capsys):
+    def fail():
+        raise RuntimeError('작업 오류')
+
+    done = threading.Event()
+    workers = d200_common.DaemonWorkers(1, 'test')
+    workers.submit(fail)
+    workers.submit(done.set)
+    assert done.wait(2)
+    assert 'RuntimeError: 작업 오류' in capsys.readouterr().err
+
+
+def test_send_hotkey_presses_every_key_of_a_combo(keyboard):
+    d200_common.send_hotkey('alt+f')
+    assert keyboard.sent == [('down', 56), ('down', 33), ('up', 33), ('up', 56)]
+
+
+@pytest.mark.parametrize('hotkey', ['alt+f', 'down', 'ctrl+alt+1', 'ctrl+a', 'ctrl+alt+shift+e'])
+def test_send_hotkey_matches_keyboard_send(keyboard, hotkey):
+    d200_common.send_hotkey(hotkey)
+    cached = list(keyboard.sent)
+    keyboard.sent.clear()
+    keyboard.send(hotkey)
+    assert cached == keyboard.sent
+
+
+def test_loads_json_strips_utf8_bom():
+    assert d200_common.loads_json(b'\xef\xbb\xbf{"a": 1}') == {'a': 1}
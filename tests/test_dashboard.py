@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Dashboard.py 테스트 (pywebview가 설치된 환경에서만 실행)"""
+
+import json
+import threading
+
+import pytest
+
+pytest.importorskip('webview')
+
+import Dashboard
+
+
+@pytest.mark.parametrize('newer, older', [
+    ('4.10.0', '4.2.0'),
+    ('4.2.0', '4.1.0 (Portable)'),
+    ('v4.1.1', '4.1'),
+])
+def test_parse_version_orders_numerically(newer, older):
+    assert Dashboard._parse_version(newer) > Dashboard._parse_version(older)
+
+
+@pytest.mark.parametrize('a, b', [
+    ('4.10', '4.10.0'),
+    ('4.1.0 (Portable)', '4.1.0'),
+    ('4', '4.0.0'),
+])
+def test_parse_version_ignores_trailing_zeros_and_suffix(a, b):
+    assert Dashboard._parse_version(a) == Dashboard._parse_version(b)
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({
+        'delays': {'after_click_ms': 120, 'export': {'wait_ms': 500}},
+        'lightroom_exe': 'C:/Lightroom.exe',
+    }), encoding='utf-8')
+    return Dashboard.ConfigManager(path)
+
+
+def test_flatten_keeps_intermediate_dicts():
+    flat = Dashboard.ConfigManager._flatten({'a': {'b': {'c': 1}}, 'd': 2})
+    assert flat == {'a': {'b': {'c': 1}}, 'a.b': {'c': 1}, 'a.b.c': 1, 'd': 2}
+
+
+def test_config_get_dotted_keys(config):
+    assert config.get('lightroom_exe') == 'C:/Lightroom.exe'
+    assert config.get('delays.after_click_ms') == 120
+    assert config.get('delays.export.wait_ms') == 500
+    assert config.get('delays.export') == {'wait_ms': 500}
+
+
+@pytest.mark.parametrize('key', ['missing', 'delays.missing', 'delays.after_click_ms.x'])
+def test_config_get_missing_key_returns_default(config, key):
+    assert config.get(key) is None
+    assert config.get(key, 7) == 7
+
+
+class FakeTimer:
+    """threading.Timer 대신 예약 정보만 기록 (테스트에서 직접 실행)"""
+
+    def __init__(self, interval, function, args=None):
+        self.interval = interval
+        self.function = function
+        self.args = args or ()
+        self.cancelled = False
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        self.function(*self.args)
+
+
+@pytest.fixture
+def played(monkeypatch):
+    sounds = []
+    monkeypatch.setattr(Dashboard.SoundPlayer, 'play', sounds.append)
+    return sounds
+
+
+@pytest.fixture
+def fake_timers(monkeypatch):
+    monkeypatch.setattr(Dashboard.threading, 'Timer', FakeTimer)
+
+
+def test_session_timer_reminds_at_m59(played, fake_timers):
+    reminders = []
+    timer = Dashboard.SessionTimer(20, on_remind=reminders.append)
+    timer.start()
+    remind_15, remind_5, finish = timer._timers
+    # 남은 시간이 15:59, 5:59가 되는 시각
+    assert [t.interval for t in timer._timers] == [20 * 60 - 959, 20 * 60 - 359, 20 * 60]
+    remind_15.fire()
+    remind_5.fire()
+    assert played == ['start', 'end_15min', 'end_5min']
+    assert reminders == ['15분 남았습니다!', '5분 남았습니다!']
+    timer.stop()
+
+
+def test_session_timer_skips_reminders_not_shorter_than_session(played, fake_timers):
+    timer = Dashboard.SessionTimer(10)
+    timer.reminder_points = {15: 'end_15min', 10: 'end_10min', 5: 'end_5min'}
+    timer.start()
+    assert [(t.interval, t.args) for t in timer._timers] == [(600 - 359, (5, 'end_5min')), (600, ())]
+    timer.stop()
+
+
+def test_session_timer_stop_cancels_pending_timers(played, fake_timers):
+    reminders = []
+    ended = []
+    timer = Dashboard.SessionTimer(20, on_remind=reminders.append, on_end=lambda: ended.append(True))
+    timer.start()
+    timer.stop()
+    assert all(t.cancelled for t in timer._timers)
+    # 취소 직전에 이미 만료된 Timer가 불려도 아무것도 하지 않음
+    for t in timer._timers:
+        t.fire()
+    assert played == ['start']
+    assert reminders == [] and ended == []
+
+
+def test_session_timer_end_order(monkeypatch):
+    events = []
+    done = threading.Event()
+    monkeypatch.setattr(Dashboard.SoundPlayer, 'play', lambda sound: events.append(('sound', sound)))
+
+    def on_end():
+        events.append(('end',))
+        done.set()
+
+    # 0.3초짜리 세션, 알림 없음
+    timer = Dashboard.SessionTimer(0.005, on_tick=lambda s: events.append(('tick', s)), on_end=on_end)
+    timer.reminder_points = {}
+    timer.start()
+    assert done.wait(2)
+    assert events[0] == ('sound', 'start')
+    assert events[-3:] == [('tick', 0), ('sound', 'end'), ('end',)]
+    assert not timer.is_running
+    assert timer.remaining_seconds == 0
+
+
+@pytest.mark.parametrize('text', ['[1, 2]', '"delays"', '{"delays": '])
+def test_config_falls_back_to_defaults_for_unusable_json(tmp_path, text):
+    path = tmp_path / 'config.json'
+    path.write_text(text, encoding='utf-8')
+    assert Dashboard.ConfigManager(path).config == Dashboard.DEFAULT_CONFIG